@@ -1,6 +1,7 @@
 # videos directories
 INPUT_DIR = "./videos/inputs"
 OUTPUT_DIR = "./videos/outputs"
+BG_CACHE_DIR = "./videos/.bg_cache"  # Persisted background images for warm-starting MOG2
 
 # motion detection settings (hysteresis thresholding)
 MOTION_THRESHOLD_PERCENT_MAX = 0.25  # Trigger clip capture when motion exceeds this
@@ -11,10 +12,25 @@ BUFFER_BEFORE = 2.0  # Seconds to include before motion starts
 BUFFER_AFTER = 4.0  # Seconds to include after motion ends
 
 # video processing settings
-FRAME_SKIP = 4  # Process every Nth frame for speed
+FRAME_SKIP = 4  # Base sampling stride; adapts between 1 and FRAME_SKIP_MAX at runtime
+FRAME_SKIP_MAX = 32  # Upper bound for the stride during long quiet stretches
+FRAME_SKIP_QUIET_SECONDS = 1.5  # Quiet video-seconds before the stride widens another step
+FRAME_SEEK_MIN_GAP = 30  # Skip gaps of at least this many frames by seeking (about one GOP)
+DECODE_QUEUE_SIZE = 8  # Max frames the decode thread may buffer ahead of analysis
+DETECT_TARGET_SIZE = 240  # Downscale so the shorter frame side is about this many pixels
+ROI = None  # Optional (y0, y1, x0, x1) crop in source pixels, e.g. to skip overlays/sky
+ROI_MASK_PATH = None  # Optional mask image path; only white regions are analyzed for motion
+HIST_GATE_THRESHOLD = 0.02  # L1 distance between luma histograms below which a frame is "unchanged"
 FALLBACK_FPS = 30.0  # FPS to use if video metadata is missing
 VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm"}
 
+# motion detector selection
+MOTION_DETECTOR = "mog2"  # "mog2" (adaptive mixtures) or "framediff" (running-average diff)
+
+# frame-differencing settings (used when MOTION_DETECTOR = "framediff")
+FRAMEDIFF_THRESHOLD = 25  # Intensity delta that counts as motion
+FRAMEDIFF_ALPHA = 0.01  # Running-average update rate per processed frame
+
 # background subtractor settings (MOG2 algorithm)
 # https://docs.opencv.org/4.x/d7/d7b/classcv_1_1BackgroundSubtractorMOG2.html
 BG_HISTORY_FRAMES = 300  # Actual video frames used to build background model
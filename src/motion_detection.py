@@ -1,24 +1,206 @@
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import timedelta
 
 import cv2
+import numpy as np
 from tqdm import tqdm
 
 from src.constants import (
+    BG_CACHE_DIR,
     BG_DETECT_SHADOWS,
     BG_HISTORY,
+    BG_HISTORY_FRAMES,
     BG_VAR_THRESHOLD,
     BUFFER_AFTER,
     BUFFER_BEFORE,
+    DECODE_QUEUE_SIZE,
+    DETECT_TARGET_SIZE,
     FALLBACK_FPS,
+    FRAMEDIFF_ALPHA,
+    FRAMEDIFF_THRESHOLD,
     FRAME_SKIP,
+    FRAME_SKIP_MAX,
+    FRAME_SKIP_QUIET_SECONDS,
+    FRAME_SEEK_MIN_GAP,
+    HIST_GATE_THRESHOLD,
     MERGE_GAP,
     MIN_CLIP_DURATION,
     MOTION_THRESHOLD_PERCENT_MAX,
     MOTION_THRESHOLD_PERCENT_MIN,
+    MOTION_DETECTOR,
     OUTPUT_DIR,
+    ROI,
+    ROI_MASK_PATH,
 )
-from src.utils import extract_clip, get_video_start_time
+from src.utils import (
+    TIMESTAMP_RE,
+    extract_clip,
+    extract_clips_batch,
+    get_video_start_time,
+    probe_video,
+)
+
+# Numba is optional: when installed, the hysteresis and range-merge kernels
+# below are JIT compiled to native code; otherwise they run as plain Python
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Whether OpenCV was built with CUDA support and a device is present.
+# Checked once at import; used to pick the GPU MOG2 implementation below.
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+
+class FrameDiffSubtractor:
+    """Frame-differencing background subtractor for static cameras.
+
+    Keeps a slowly-updated running average of the scene and thresholds the
+    absolute difference of each frame against it. No per-pixel mixture
+    updates, so far less memory traffic than MOG2; a good fit for footage
+    where the camera never moves. Mirrors the slice of the OpenCV
+    BackgroundSubtractor API the detect loop uses.
+    """
+
+    def __init__(self):
+        self.background: np.ndarray | None = None  # float32 running average
+
+    def apply(self, frame: np.ndarray, learningRate: float = -1) -> np.ndarray:
+        """Return the foreground mask for a frame and update the background.
+
+        Args:
+            frame: BGR or grayscale frame.
+            learningRate: Running-average update rate; negative means the
+                default FRAMEDIFF_ALPHA.
+
+        Returns:
+            A binary uint8 foreground mask.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if self.background is None:
+            self.background = gray.astype(np.float32)
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        _, mask = cv2.threshold(diff, FRAMEDIFF_THRESHOLD, 255, cv2.THRESH_BINARY)
+
+        # Callers pass a stride-scaled MOG2-style rate; rescale it so the
+        # default stride maps onto FRAMEDIFF_ALPHA
+        alpha = (
+            FRAMEDIFF_ALPHA
+            if learningRate < 0
+            else min(1.0, learningRate * FRAMEDIFF_ALPHA * BG_HISTORY_FRAMES / FRAME_SKIP)
+        )
+        cv2.accumulateWeighted(gray, self.background, alpha)
+        return mask
+
+    def getBackgroundImage(self) -> np.ndarray | None:
+        """Return the current background estimate as uint8, or None."""
+        if self.background is None:
+            return None
+        return cv2.convertScaleAbs(self.background)
+
+
+def create_background_subtractor():
+    """Create the configured background subtractor.
+
+    MOTION_DETECTOR picks between MOG2 (on the GPU when available) and the
+    cheaper frame-differencing subtractor. For MOG2, the CUDA
+    implementation runs the per-pixel Gaussian-mixture updates in parallel
+    on the device; frames are uploaded as GpuMat and only the (much
+    smaller) foreground mask is downloaded back.
+
+    Returns:
+        A CPU or CUDA BackgroundSubtractorMOG2, or a FrameDiffSubtractor.
+    """
+    if MOTION_DETECTOR == "framediff":
+        return FrameDiffSubtractor()
+    if CUDA_AVAILABLE:
+        return cv2.cuda.createBackgroundSubtractorMOG2(
+            history=BG_HISTORY, varThreshold=BG_VAR_THRESHOLD, detectShadows=BG_DETECT_SHADOWS
+        )
+    return cv2.createBackgroundSubtractorMOG2(
+        history=BG_HISTORY, varThreshold=BG_VAR_THRESHOLD, detectShadows=BG_DETECT_SHADOWS
+    )
+
+
+def background_cache_path(video_path: str, frame_width: int, frame_height: int) -> str:
+    """Path of the persisted background image for this video's camera.
+
+    Videos from the same fixed camera share a background, so the cache is
+    keyed by the filename prefix before the Ring timestamp (or "camera"
+    when there is none) plus the frame dimensions, which invalidates the
+    cache when the resolution changes.
+
+    Args:
+        video_path: Path to the video file.
+        frame_width: Source frame width in pixels.
+        frame_height: Source frame height in pixels.
+
+    Returns:
+        Path of the cache file for this camera and resolution.
+    """
+    filename = os.path.basename(video_path)
+    match = TIMESTAMP_RE.search(filename)
+    camera = filename[: match.start()].strip("_") if match else ""
+    return os.path.join(BG_CACHE_DIR, f"{camera or 'camera'}_{frame_width}x{frame_height}.png")
+
+
+def open_video_capture(video_path: str) -> cv2.VideoCapture:
+    """Open a video for reading, requesting hardware-accelerated decoding.
+
+    Asks the FFmpeg backend for any available decode accelerator (NVDEC,
+    VAAPI, ...); OpenCV falls back to software decoding transparently when
+    none is present, so this is safe on CPU-only machines.
+
+    Args:
+        video_path: Path to the video file.
+
+    Returns:
+        An opened (or failed-to-open) cv2.VideoCapture.
+    """
+    # Let FFmpeg spread H.264/HEVC decode across cores (same effect as
+    # PyAV's thread_type='AUTO'); respected on the next capture open
+    os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "threads;auto")
+    return cv2.VideoCapture(
+        video_path,
+        cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+    )
+
+
+def configure_opencv(num_threads: int) -> None:
+    """Set OpenCV's thread-pool size and disable OpenCL for this process.
+
+    The transparent OpenCL layer (T-API) adds device probing and host to
+    device copies that never pay off on the small grayscale frames the
+    detect loop feeds it, so it is switched off explicitly rather than
+    left to OpenCV's runtime guess.
+
+    Args:
+        num_threads: Threads for OpenCV's internal pool.
+    """
+    cv2.setNumThreads(num_threads)
+    try:
+        cv2.ocl.setUseOpenCL(False)
+    except AttributeError:
+        pass  # Build without OpenCL support
+
+
+def init_worker() -> None:
+    """Pool initializer: keep OpenCV single-threaded inside workers.
+
+    With several videos in flight the process pool supplies the
+    parallelism; per-worker OpenCV thread pools would only oversubscribe
+    the cores.
+    """
+    configure_opencv(1)
 
 
 def process_videos(video_files: list[str]) -> None:
@@ -32,21 +214,43 @@ def process_videos(video_files: list[str]) -> None:
 
     total = len(video_files)
     total_clips = 0
-
-    for i, video_path in enumerate(sorted(video_files), 1):
-        clips = process_video(video_path, i, total)
-        total_clips += clips
+    sorted_files = sorted(video_files)
+
+    # Half the cores: ffmpeg and OpenCV thread internally, so more workers
+    # just oversubscribe
+    max_workers = min(total, max(1, (os.cpu_count() or 2) // 2))
+
+    if max_workers == 1:
+        # Single process: give OpenCV the whole machine
+        configure_opencv(os.cpu_count() or 1)
+        for i, video_path in enumerate(sorted_files, 1):
+            total_clips += process_video(video_path, i, total)
+    else:
+        # Processes, not threads: cap.read() holds the GIL during decode.
+        # Workers print one summary line each; progress bars are disabled
+        # to avoid interleaved terminal output.
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+            futures = [
+                executor.submit(process_video, path, i, total, False)
+                for i, path in enumerate(sorted_files, 1)
+            ]
+            for future in as_completed(futures):
+                total_clips += future.result()
 
     print(f"\nExtracted {total_clips} clips to `{OUTPUT_DIR}`")
 
 
-def process_video(video_path: str, index: int, total: int) -> int:
+def process_video(
+    video_path: str, index: int, total: int, show_progress: bool = True
+) -> int:
     """Process a single video: detect motion, merge timestamps, extract clips.
 
     Args:
         video_path: Path to the video file to process.
         index: Current video index (1-based).
         total: Total number of videos.
+        show_progress: Whether to show the progress bar and rewrite the
+            summary line in place (disabled when running in a worker pool).
 
     Returns:
         The number of clips extracted.
@@ -54,16 +258,24 @@ def process_video(video_path: str, index: int, total: int) -> int:
     video_name = os.path.basename(video_path)
     prefix = f"[{index}/{total}] {video_name}"
 
-    duration = get_video_duration(video_path)
-    if duration <= 0:
-        print(f"{prefix} -- error: could not read video")
-        return 0
+    # One ffprobe call covers duration, fps and dimensions; for containers
+    # ffprobe cannot read, the detect pass recovers the duration from the
+    # capture it opens anyway
+    meta = probe_video(video_path)
+    duration = meta.get("duration", 0.0)
 
-    # Print header line (will be overwritten with summary later)
-    print(prefix)
+    if show_progress:
+        # Print header line (will be overwritten with summary later)
+        print(prefix)
 
     # Detect motion with progress bar on next line
-    raw_ranges, motion_frames = detect_motion_ranges_with_progress(video_path, duration)
+    raw_ranges, motion_frames, duration = detect_motion_ranges_with_progress(
+        video_path, duration, show_progress, meta
+    )
+    if duration <= 0:
+        line = f"{prefix} -- error: could not read video"
+        print(f"\033[A\r{line}" if show_progress else line)
+        return 0
 
     ranges = merge_motion_ranges(raw_ranges, duration)
     clips_extracted = 0
@@ -71,47 +283,35 @@ def process_video(video_path: str, index: int, total: int) -> int:
     if ranges:
         video_start_time = get_video_start_time(video_path)
 
+        clip_jobs = []
         for start, end in ranges:
             motion_time = video_start_time + timedelta(seconds=start)
             time_str = motion_time.strftime("%Y-%m-%d_%H.%M.%S")
             output_name = f"{time_str}.mp4"
             output_path = os.path.join(OUTPUT_DIR, output_name)
+            clip_jobs.append((start, end, output_path))
 
-            if extract_clip(video_path, output_path, start, end):
-                clips_extracted += 1
+        # One ffmpeg invocation for all clips; fall back to per-clip
+        # extraction so a single bad range doesn't lose the whole batch
+        if extract_clips_batch(video_path, clip_jobs):
+            clips_extracted = len(clip_jobs)
+        else:
+            for start, end, output_path in clip_jobs:
+                if extract_clip(video_path, output_path, start, end):
+                    clips_extracted += 1
 
-    # Move cursor up one line, overwrite with summary
-    print(f"\033[A\r{prefix} -- {clips_extracted} clips, {motion_frames} motion frames")
+    if show_progress:
+        # Move cursor up one line, overwrite with summary
+        print(f"\033[A\r{prefix} -- {clips_extracted} clips, {motion_frames} motion frames")
+    else:
+        print(f"{prefix} -- {clips_extracted} clips, {motion_frames} motion frames")
 
     return clips_extracted
 
 
-def get_video_duration(video_path: str) -> float:
-    """Get video duration in seconds using OpenCV.
-
-    Args:
-        video_path: Path to the video file to process.
-
-    Returns:
-        The duration of the video in seconds.
-    """
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        return 0.0
-
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-    cap.release()
-
-    if fps <= 0:
-        return 0.0
-
-    return frame_count / fps
-
-
 def detect_motion_ranges_with_progress(
-    video_path: str, duration: float
-) -> tuple[list[tuple[float, float]], int]:
+    video_path: str, duration: float, show_progress: bool = True, meta: dict | None = None
+) -> tuple[list[tuple[float, float]], int, float]:
     """Detect motion ranges using hysteresis thresholding, with progress bar.
 
     Uses two thresholds:
@@ -124,112 +324,498 @@ def detect_motion_ranges_with_progress(
 
     Args:
         video_path: Path to the video file to process.
-        duration: Video duration in seconds.
+        duration: Video duration in seconds; pass 0 to have it derived
+            from the capture's frame count instead.
+        show_progress: Whether to display the tqdm progress bar.
+        meta: Optional metadata from probe_video (fps, width, height,
+            frame_count); missing fields are read from the capture instead.
 
     Returns:
-        A tuple of (confirmed motion ranges, motion frame count).
+        A tuple of (confirmed motion ranges, motion frame count, resolved
+        duration in seconds); the duration is 0 when the video is
+        unreadable.
     """
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video_capture(video_path)
     if not cap.isOpened():
-        return [], 0
+        return [], 0, 0.0
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    meta = meta or {}
+    fps = meta.get("fps", 0.0) or cap.get(cv2.CAP_PROP_FPS)
     if fps <= 0:
         fps = FALLBACK_FPS
 
     # Calculate motion thresholds from frame dimensions
-    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    frame_area = frame_width * frame_height
+    frame_width = meta.get("width", 0) or int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    frame_height = meta.get("height", 0) or int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    # Detection only sees the ROI crop (when configured), so thresholds
+    # are computed from the cropped dimensions
+    detect_width, detect_height = frame_width, frame_height
+    if ROI is not None:
+        roi_y0, roi_y1, roi_x0, roi_x1 = ROI
+        detect_height = roi_y1 - roi_y0
+        detect_width = roi_x1 - roi_x0
+
+    # Motion decisions only need coarse blobs, so detection runs on frames
+    # downscaled by an integer divisor that puts the shorter side near
+    # DETECT_TARGET_SIZE px (1080p -> 1/4, 1440p -> 1/6, small inputs
+    # untouched); thresholds scale by the same factor squared
+    detect_scale = 1.0 / max(1, min(detect_width, detect_height) // DETECT_TARGET_SIZE)
+    frame_area = detect_width * detect_height * detect_scale * detect_scale
     threshold_min = frame_area * (MOTION_THRESHOLD_PERCENT_MIN / 100)
     threshold_max = frame_area * (MOTION_THRESHOLD_PERCENT_MAX / 100)
 
     # Background subtractor - good for static cameras
-    bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-        history=BG_HISTORY, varThreshold=BG_VAR_THRESHOLD, detectShadows=BG_DETECT_SHADOWS
-    )
+    bg_subtractor = create_background_subtractor()
+    use_cuda = CUDA_AVAILABLE and MOTION_DETECTOR == "mog2"
+    if use_cuda:
+        gpu_frame = cv2.cuda_GpuMat()
+        # Dedicated stream (not the default/null one) so uploads and MOG2
+        # kernels can overlap instead of serializing on the device
+        gpu_stream = cv2.cuda.Stream()
+
+    # Warm-start from the previous video of the same camera: seeding the
+    # model with the saved background skips the BG_HISTORY-frame warmup
+    # during which MOG2 masks are unreliable (CPU subtractor only). Full
+    # model serialization (Algorithm.save/load to a FileStorage yml) is
+    # not an option here: OpenCV's MOG2 does not implement write/read, so
+    # the saved file carries no mixture state; the background image is
+    # the richest state the Python API exposes.
+    scaled_size = (round(detect_width * detect_scale), round(detect_height * detect_scale))
+    cache_path = background_cache_path(video_path, frame_width, frame_height)
+    if not use_cuda:
+        cached_background = cv2.imread(cache_path, cv2.IMREAD_GRAYSCALE)
+        if cached_background is not None and cached_background.shape[1::-1] == scaled_size:
+            bg_subtractor.apply(cached_background, learningRate=1)
+
+    # Per-frame motion areas and timestamps, preallocated from the frame
+    # count so the hot loop only does two array stores per kept frame; the
+    # hysteresis pass runs once over the arrays after decoding finishes
+    frame_count = meta.get("frame_count", 0) or int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    # Containers ffprobe could not read: derive the duration from the
+    # capture that is open anyway instead of a separate metadata open
+    if duration <= 0 and frame_count > 0:
+        duration = frame_count / fps
+    if duration <= 0:
+        cap.release()
+        return [], 0, 0.0
+
+    capacity = max(16, frame_count // FRAME_SKIP + 2)
+    times = np.empty(capacity, np.float64)
+    areas = np.empty(capacity, np.float32)
+    kept = 0
 
-    confirmed_ranges: list[tuple[float, float]] = []
-    frame_idx = 0
     motion_frames = 0
 
-    # State machine for hysteresis tracking
-    tracking = False
-    track_start = 0.0
-    has_dramatic_motion = False
+    # Histogram gate state: last frame's normalized luma histogram and the
+    # last computed motion area
+    prev_hist = None
+    last_area = 0.0
+
+    # Video time of the last frame with motion, and of the last stride
+    # widening: the stride grows with how long the scene has been quiet,
+    # which ramps at the same rate in video-seconds at any current stride
+    # (a frame count would ramp ever slower as the stride widens)
+    last_motion_time = 0.0
+    last_widen_time = 0.0
+
+    # Last time the motion-frame count in the bar description was redrawn
+    last_desc_update = 0.0
+
+    # Progress position only moves in whole seconds, so redraws are
+    # limited to when the integer second actually changes
+    int_duration = int(duration)
+    last_second = -1
+
+    # Reused 3x3 kernel for opening the foreground mask
+    morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+    # Reused mask buffer: passing it as dst to MOG2 avoids allocating (and
+    # garbage-collecting) a fresh full-mask ndarray every frame
+    fg_mask = np.empty((scaled_size[1], scaled_size[0]), np.uint8)
+
+    # Optional free-form mask for irregular exclusion zones (a street, a
+    # neighbor's yard) that a rectangular ROI can't express: pixels outside
+    # the white region are zeroed before the subtractor ever sees them
+    roi_mask = None
+    if ROI_MASK_PATH is not None:
+        roi_mask = cv2.imread(ROI_MASK_PATH, cv2.IMREAD_GRAYSCALE)
+        if roi_mask is None:
+            print(f"  Warning: could not read ROI mask `{ROI_MASK_PATH}`, ignoring")
+        else:
+            if roi_mask.shape[1::-1] != scaled_size:
+                roi_mask = cv2.resize(roi_mask, scaled_size, interpolation=cv2.INTER_NEAREST)
+            _, roi_mask = cv2.threshold(roi_mask, 127, 255, cv2.THRESH_BINARY)
+
+    # Sampling stride shared with the decode thread: the analysis side
+    # widens it through quiet stretches and snaps it back to 1 on motion,
+    # so boundaries stay accurate while idle footage is skimmed. A dict
+    # slot keeps the cross-thread update simple (reads/writes are atomic
+    # under the GIL; a frame or two of lag is harmless).
+    skip_state = {"skip": FRAME_SKIP}
+
+    # Decode and analysis run concurrently: cap.read and MOG2 both release
+    # the GIL, so a 2-thread pipeline overlaps them on separate cores. The
+    # bounded queue keeps the decoder at most a few frames ahead.
+    frame_queue: queue.Queue = queue.Queue(maxsize=DECODE_QUEUE_SIZE)
+
+    def decode_frames() -> None:
+        """Producer: decode, skip, and downscale frames for analysis."""
+        inv_fps = 1.0 / fps
+        frame_idx = 0
+        next_keep = 0
+        while True:
+            # Wide gaps jump straight to the next kept frame: the seek
+            # decodes forward only from the nearest keyframe, where
+            # grab-and-drop would decode every skipped frame. Below about
+            # a GOP's worth of frames the seek re-decodes more than it
+            # saves, so small gaps still drain through grab().
+            gap = next_keep - frame_idx
+            if gap >= FRAME_SEEK_MIN_GAP and cap.set(cv2.CAP_PROP_POS_FRAMES, next_keep):
+                frame_idx = next_keep
+
+            # grab() only demuxes and advances decoder state; the YUV->BGR
+            # conversion in retrieve() is paid on kept frames only
+            if not cap.grab():
+                break
+
+            # Skip frames for speed (stride is adapted by the analysis side)
+            if frame_idx < next_keep:
+                frame_idx += 1
+                continue
+
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            stride = skip_state["skip"]
+            next_keep = frame_idx + stride
+
+            # Crop to the ROI first: overlays and sky only generate
+            # spurious responses and cost compute
+            if ROI is not None:
+                frame = frame[roi_y0:roi_y1, roi_x0:roi_x1]
+
+            # Downscale before the subtractor: MOG2 is memory-bound, so the
+            # win is near-linear in pixels removed
+            if detect_scale < 1.0:
+                frame = cv2.resize(
+                    frame, None, fx=detect_scale, fy=detect_scale, interpolation=cv2.INTER_AREA
+                )
+
+            # Single-channel luma is all the subtractor needs: 3x less data
+            # through MOG2 and every downstream mask pass
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+            if roi_mask is not None:
+                frame = cv2.bitwise_and(frame, roi_mask)
+
+            frame_queue.put((frame_idx * inv_fps, frame, stride))
+            frame_idx += 1
+
+        frame_queue.put(None)  # Sentinel: end of stream
+
+    producer = threading.Thread(target=decode_frames, daemon=True)
+    producer.start()
 
     with tqdm(
         total=int(duration),
         bar_format="  {desc}|{bar:50}| {percentage:3.0f}%",
         leave=False,
         ascii=" #",
+        disable=not show_progress,
     ) as pbar:
         pbar.set_description("[0 motion frames] ")
 
+        # Bind the per-frame calls to locals: attribute lookups on cv2 and
+        # the subtractor are dict probes the loop would otherwise repeat
+        # tens of thousands of times per video
+        queue_get = frame_queue.get
+        bg_apply = bg_subtractor.apply
+        calc_hist = cv2.calcHist
+        normalize = cv2.normalize
+        morphology_ex = cv2.morphologyEx
+        count_nonzero = cv2.countNonZero
+        connected_components = cv2.connectedComponentsWithStats
+
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            item = queue_get()
+            if item is None:
                 break
+            current_time, frame, stride = item
+
+            # Scale the model update by the stride so background adaptation
+            # stays constant in video-seconds whatever the sampling rate
+            learning_rate = stride / BG_HISTORY_FRAMES
+
+            # Update progress bar once per second of video
+            second = int(current_time)
+            if second != last_second:
+                pbar.n = min(second, int_duration)
+                pbar.refresh()
+                last_second = second
+
+            # Cheapest pre-filter: an 8-bin luma histogram that matches the
+            # previous frame means nothing moved, so skip the subtractor
+            # entirely. Only taken while no motion is in progress; the
+            # model re-warms after a skipped stretch, which the
+            # warm-started background makes quick.
+            hist = calc_hist([frame], [0], None, [8], [0, 256])
+            normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
+            unchanged = (
+                prev_hist is not None
+                and last_area < threshold_min
+                and float(np.abs(hist - prev_hist).sum()) < HIST_GATE_THRESHOLD
+            )
+            prev_hist = hist
+
+            if unchanged:
+                frame_max_area = 0
+            else:
+                # Apply background subtraction (on the GPU when available)
+                if use_cuda:
+                    gpu_frame.upload(frame)
+                    fg_mask = bg_apply(gpu_frame, learning_rate, gpu_stream).download()
+                elif MOTION_DETECTOR == "framediff":
+                    fg_mask = bg_apply(frame, learningRate=learning_rate)
+                else:
+                    # dst form: MOG2 writes into the preallocated buffer
+                    fg_mask = bg_apply(frame, fg_mask, learning_rate)
+
+                # Opening removes speckle noise before any pixel counting,
+                # so tiny blobs neither trip the gate nor feed the labeling
+                # pass; dst= reuses the mask buffer instead of allocating
+                morphology_ex(fg_mask, cv2.MORPH_OPEN, morph_kernel, dst=fg_mask)
+
+                # Cheap gate: total foreground pixels bound the largest blob
+                # from above, so quiet frames skip the labeling pass
+                if count_nonzero(fg_mask) < threshold_min:
+                    frame_max_area = 0
+                else:
+                    # Largest connected region in one C call plus a NumPy
+                    # reduction -- no Python-per-contour loop, and labeling
+                    # is O(pixels) regardless of how many noise blobs the
+                    # mask contains
+                    num_labels, _, stats, _ = connected_components(fg_mask, connectivity=8)
+                    frame_max_area = (
+                        int(stats[1:, cv2.CC_STAT_AREA].max()) if num_labels > 1 else 0
+                    )
+            last_area = frame_max_area
+
+            # Record this frame; grow the arrays if metadata undercounted
+            if kept == times.shape[0]:
+                times = np.concatenate([times, np.empty_like(times)])
+                areas = np.concatenate([areas, np.empty_like(areas)])
+            times[kept] = current_time
+            areas[kept] = frame_max_area
+            kept += 1
+
+            # Adapt the stride: sample every frame while motion is in
+            # progress, double the stride for every quiet interval after it
+            if frame_max_area >= threshold_min:
+                motion_frames += 1
+                # Redraw the description at most ~5x per second; every
+                # set_description call rewrites the whole bar line
+                now = time.monotonic()
+                if now - last_desc_update >= 0.2:
+                    pbar.set_description(f"[{motion_frames} motion frames] ")
+                    last_desc_update = now
+                skip_state["skip"] = 1
+                last_motion_time = current_time
+                last_widen_time = current_time
+            elif (
+                current_time - last_motion_time > FRAME_SKIP_QUIET_SECONDS
+                and current_time - last_widen_time > FRAME_SKIP_QUIET_SECONDS
+            ):
+                skip_state["skip"] = min(
+                    max(skip_state["skip"], FRAME_SKIP) * 2, FRAME_SKIP_MAX
+                )
+                last_widen_time = current_time
 
-            current_time = frame_idx / fps
+        # Final update
+        pbar.n = int_duration
+        pbar.refresh()
 
-            # Update progress bar
-            pbar.n = min(int(current_time), int(duration))
-            pbar.refresh()
+    producer.join()
+    cap.release()
 
-            # Skip frames for speed
-            if frame_idx % FRAME_SKIP != 0:
-                frame_idx += 1
-                continue
+    # Persist the learned background for the next video from this camera.
+    # Pool workers handling the same camera race on the cache file, so
+    # write to a per-process temp file and rename it into place: os.replace
+    # is atomic, so readers always see a complete old or new image instead
+    # of a truncated PNG (which imread rejects, silently losing the warm
+    # start).
+    if not use_cuda:
+        background = bg_subtractor.getBackgroundImage()
+        if background is not None and background.size:
+            os.makedirs(BG_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.png"
+            if cv2.imwrite(tmp_path, background):
+                os.replace(tmp_path, cache_path)
+
+    confirmed_ranges = hysteresis_ranges(
+        times[:kept], areas[:kept], threshold_min, threshold_max, duration
+    )
+    return confirmed_ranges, motion_frames, duration
 
-            # Apply background subtraction
-            fg_mask = bg_subtractor.apply(frame)
 
-            # Find contours in the foreground mask
-            contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+def hysteresis_ranges(
+    times: np.ndarray,
+    areas: np.ndarray,
+    threshold_min: float,
+    threshold_max: float,
+    duration: float,
+) -> list[tuple[float, float]]:
+    """Run the two-threshold state machine over per-frame motion areas.
 
-            # Find largest contour area in this frame
-            frame_max_area = 0
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                frame_max_area = max(frame_max_area, area)
+    Tracks a potential clip while areas stay above MIN and confirms it once
+    any area exceeds MAX; a clip still open at the end of the video is
+    closed at the video duration.
 
-            # Hysteresis state machine
-            if frame_max_area >= threshold_min:
-                motion_frames += 1
-                pbar.set_description(f"[{motion_frames} motion frames] ")
-
-                if not tracking:
-                    # Start tracking potential clip
-                    tracking = True
-                    track_start = current_time
-                    has_dramatic_motion = False
-
-                if frame_max_area >= threshold_max:
-                    # Dramatic motion detected - confirm this clip
-                    has_dramatic_motion = True
-
-            elif tracking:
-                # Motion dropped below MIN - end tracking
-                if has_dramatic_motion:
-                    # Save confirmed clip
-                    confirmed_ranges.append((track_start, current_time))
-                # Reset state
-                tracking = False
+    Args:
+        times: Timestamps (seconds) of the processed frames, in order.
+        areas: Largest motion blob area per processed frame.
+        threshold_min: Area that starts/extends a potential clip.
+        threshold_max: Area that confirms a clip should be saved.
+        duration: Video duration in seconds.
+
+    Returns:
+        A list of confirmed (start, end) motion ranges.
+    """
+    starts, ends = _hysteresis_kernel(
+        np.ascontiguousarray(times),
+        np.ascontiguousarray(areas),
+        threshold_min,
+        threshold_max,
+        duration,
+    )
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _hysteresis_kernel(times, areas, threshold_min, threshold_max, duration):
+    """Two-threshold state machine over per-frame areas (array kernel).
+
+    Emits confirmed (start, end) pairs into preallocated arrays and
+    returns trimmed slices. JIT compiled with numba when available.
+    """
+    n = times.shape[0]
+    out_starts = np.empty(n, np.float64)
+    out_ends = np.empty(n, np.float64)
+    count = 0
+
+    tracking = False
+    track_start = 0.0
+    has_dramatic_motion = False
+
+    for i in range(n):
+        area = areas[i]
+
+        if area >= threshold_min:
+            if not tracking:
+                # Start tracking potential clip
+                tracking = True
+                track_start = times[i]
                 has_dramatic_motion = False
 
-            frame_idx += 1
+            if area >= threshold_max:
+                # Dramatic motion detected - confirm this clip
+                has_dramatic_motion = True
 
-        # Handle case where video ends while tracking
-        if tracking and has_dramatic_motion:
-            confirmed_ranges.append((track_start, duration))
+        elif tracking:
+            # Motion dropped below MIN - end tracking
+            if has_dramatic_motion:
+                out_starts[count] = track_start
+                out_ends[count] = times[i]
+                count += 1
+            tracking = False
+            has_dramatic_motion = False
 
-        # Final update
-        pbar.n = int(duration)
-        pbar.refresh()
+    # Handle case where video ends while tracking
+    if tracking and has_dramatic_motion:
+        out_starts[count] = track_start
+        out_ends[count] = duration
+        count += 1
+
+    return out_starts[:count], out_ends[:count]
+
+
+if njit is not None:
+    _hysteresis_kernel = njit(cache=True)(_hysteresis_kernel)
+
+
+def _merge_ranges_kernel(starts, ends, merge_gap, min_duration, buffer_before, buffer_after, video_duration):
+    """Merge sorted ranges, add buffers, and drop short clips (array kernel).
+
+    Operates on parallel float64 arrays sorted by start time and returns
+    trimmed (starts, ends) arrays. JIT compiled with numba when available.
+    """
+    n = starts.shape[0]
+    out_starts = np.empty(n, np.float64)
+    out_ends = np.empty(n, np.float64)
+
+    # Merge nearby ranges
+    count = 0
+    current_start = starts[0]
+    current_end = ends[0]
+    for i in range(1, n):
+        if starts[i] - current_end <= merge_gap:
+            # Extend current range
+            if ends[i] > current_end:
+                current_end = ends[i]
+        else:
+            # Save current range and start new one
+            out_starts[count] = current_start
+            out_ends[count] = current_end
+            count += 1
+            current_start = starts[i]
+            current_end = ends[i]
+
+    # Don't forget the last range
+    out_starts[count] = current_start
+    out_ends[count] = current_end
+    count += 1
+
+    # Add buffers and filter short clips, compacting in place
+    kept = 0
+    for i in range(count):
+        if out_ends[i] - out_starts[i] < min_duration:
+            continue
+        out_starts[kept] = max(0.0, out_starts[i] - buffer_before)
+        out_ends[kept] = min(video_duration, out_ends[i] + buffer_after)
+        kept += 1
+
+    return out_starts[:kept], out_ends[:kept]
 
-    cap.release()
-    return confirmed_ranges, motion_frames
+
+def _merge_ranges_vectorized(
+    starts, ends, merge_gap, min_duration, buffer_before, buffer_after, video_duration
+):
+    """Vectorized equivalent of _merge_ranges_kernel.
+
+    Replaces the per-range scan with a handful of NumPy reductions: split
+    points are where a start exceeds the running maximum end by more than
+    the merge gap, and reduceat collapses each group. Used when numba is
+    not installed.
+    """
+    run_max_end = np.maximum.accumulate(ends)
+    split = np.where(starts[1:] - run_max_end[:-1] > merge_gap)[0] + 1
+    group_starts = np.concatenate(([0], split))
+
+    merged_starts = starts[group_starts]  # Sorted input: group min is its first start
+    merged_ends = np.maximum.reduceat(ends, group_starts)
+
+    keep = merged_ends - merged_starts >= min_duration
+    buffered_starts = np.clip(merged_starts[keep] - buffer_before, 0, None)
+    buffered_ends = np.clip(merged_ends[keep] + buffer_after, None, video_duration)
+    return buffered_starts, buffered_ends
+
+
+if njit is not None:
+    _merge_ranges_kernel = njit(cache=True)(_merge_ranges_kernel)
+else:
+    # Without numba the scalar loop would run interpreted; the vectorized
+    # form is the faster pure-NumPy fallback
+    _merge_ranges_kernel = _merge_ranges_vectorized
 
 
 def merge_motion_ranges(
@@ -247,35 +833,16 @@ def merge_motion_ranges(
     if not ranges:
         return []
 
-    # Sort by start time
-    sorted_ranges = sorted(ranges, key=lambda r: r[0])
-
-    # Merge nearby ranges
-    merged = []
-    current_start, current_end = sorted_ranges[0]
-
-    for start, end in sorted_ranges[1:]:
-        if start - current_end <= MERGE_GAP:
-            # Extend current range
-            current_end = max(current_end, end)
-        else:
-            # Save current range and start new one
-            merged.append((current_start, current_end))
-            current_start, current_end = start, end
+    # hysteresis_ranges emits ranges in start order already, so a cheap
+    # O(N) sortedness check usually replaces the O(N log N) sort
+    arr = np.asarray(ranges, dtype=np.float64)
+    if arr.shape[0] > 1 and np.any(np.diff(arr[:, 0]) < 0):
+        arr = arr[np.argsort(arr[:, 0], kind="stable")]
+    starts = np.ascontiguousarray(arr[:, 0])
+    ends = np.ascontiguousarray(arr[:, 1])
 
-    # Don't forget the last range
-    merged.append((current_start, current_end))
-
-    # Add buffers and filter short clips
-    final_ranges = []
-    for start, end in merged:
-        duration = end - start
-        if duration < MIN_CLIP_DURATION:
-            continue
-
-        # Add buffers, clamped to video bounds
-        buffered_start = max(0, start - BUFFER_BEFORE)
-        buffered_end = min(video_duration, end + BUFFER_AFTER)
-        final_ranges.append((buffered_start, buffered_end))
+    merged_starts, merged_ends = _merge_ranges_kernel(
+        starts, ends, MERGE_GAP, MIN_CLIP_DURATION, BUFFER_BEFORE, BUFFER_AFTER, video_duration
+    )
 
-    return final_ranges
+    return list(zip(merged_starts.tolist(), merged_ends.tolist()))
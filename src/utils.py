@@ -1,3 +1,4 @@
+import json
 import os
 import re
 import subprocess
@@ -8,8 +9,13 @@ import static_ffmpeg
 
 from src.constants import INPUT_DIR, OUTPUT_DIR, VIDEO_EXTENSIONS
 
-# Download ffmpeg binary if needed (runs once at module import)
-static_ffmpeg.add_paths()
+# Download ffmpeg binary if needed (runs once at module import); weak=True
+# skips the filesystem probe/download when ffmpeg is already on PATH
+static_ffmpeg.add_paths(weak=True)
+
+# Ring camera filename timestamp (..._YYYYMMDD_HHMM_...), compiled once:
+# start-time lookups and background-cache keys run it per video
+TIMESTAMP_RE = re.compile(r"(\d{8})_(\d{4})")
 
 
 def list_video_files() -> list[str]:
@@ -17,12 +23,15 @@ def list_video_files() -> list[str]:
     os.makedirs(INPUT_DIR, exist_ok=True)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    video_files = [
-        os.path.join(INPUT_DIR, f)
-        for f in os.listdir(INPUT_DIR)
-        if os.path.isfile(os.path.join(INPUT_DIR, f))
-        and os.path.splitext(f)[1].lower() in VIDEO_EXTENSIONS
-    ]
+    # scandir returns entries with the file type already cached, so no
+    # extra stat syscall per file (noticeable on network filesystems)
+    with os.scandir(INPUT_DIR) as entries:
+        video_files = [
+            entry.path
+            for entry in entries
+            if entry.is_file(follow_symlinks=False)
+            and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS
+        ]
 
     if not video_files:
         print(f"No video files found in {INPUT_DIR}/")
@@ -50,12 +59,20 @@ def get_video_start_time(video_path: str) -> datetime:
     filename = os.path.basename(video_path)
 
     # Try to match Ring camera format: Ring_YYYYMMDD_HHMM_... (timestamp is UTC)
-    match = re.search(r"(\d{8})_(\d{4})", filename)
+    match = TIMESTAMP_RE.search(filename)
     if match:
         date_str, time_str = match.groups()
         try:
-            utc_time = datetime.strptime(f"{date_str}_{time_str}", "%Y%m%d_%H%M")
-            utc_time = utc_time.replace(tzinfo=timezone.utc)
+            # The fields are fixed-width digits, so slice them directly
+            # instead of re-parsing through a strptime format string
+            utc_time = datetime(
+                int(date_str[:4]),
+                int(date_str[4:6]),
+                int(date_str[6:8]),
+                int(time_str[:2]),
+                int(time_str[2:4]),
+                tzinfo=timezone.utc,
+            )
             return utc_time.astimezone().replace(tzinfo=None)
         except ValueError:
             pass
@@ -64,7 +81,125 @@ def get_video_start_time(video_path: str) -> datetime:
     return datetime.fromtimestamp(os.path.getmtime(video_path))
 
 
-def extract_clip(input_path: str, output_path: str, start: float, end: float) -> bool:
+# Whether ffmpeg ships the h264_nvenc encoder; probed once on first use
+_nvenc_available: bool | None = None
+
+
+def nvenc_available() -> bool:
+    """Check (once) whether ffmpeg on this machine has the NVENC encoder.
+
+    Returns:
+        True if h264_nvenc is listed by `ffmpeg -encoders`.
+    """
+    global _nvenc_available
+    if _nvenc_available is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            _nvenc_available = "h264_nvenc" in result.stdout
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            _nvenc_available = False
+    return _nvenc_available
+
+
+def probe_video(video_path: str) -> dict:
+    """Read video stream metadata with a single ffprobe call.
+
+    One probe replaces the two container opens previously needed to read
+    the duration and then the stream properties with OpenCV.
+
+    Args:
+        video_path: Path to the video file.
+
+    Returns:
+        A dict with fps, duration, width, height and frame_count keys
+        (zero for fields ffprobe could not determine), or an empty dict
+        if probing failed entirely.
+    """
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=nb_frames,r_frame_rate,width,height,duration",
+        "-of",
+        "json",
+        video_path,
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        stream = json.loads(result.stdout)["streams"][0]
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError, KeyError, IndexError):
+        return {}
+
+    fps = 0.0
+    rate = stream.get("r_frame_rate", "")
+    if "/" in rate:
+        num, _, den = rate.partition("/")
+        try:
+            fps = float(num) / float(den) if float(den) else 0.0
+        except ValueError:
+            pass
+
+    frame_count = int(stream.get("nb_frames", 0) or 0)
+    duration = float(stream.get("duration", 0.0) or 0.0)
+    if duration <= 0 and fps > 0 and frame_count > 0:
+        duration = frame_count / fps
+
+    return {
+        "fps": fps,
+        "duration": duration,
+        "width": int(stream.get("width", 0) or 0),
+        "height": int(stream.get("height", 0) or 0),
+        "frame_count": frame_count,
+    }
+
+
+def run_ffmpeg_quiet(cmd: list[str]) -> bool:
+    """Run an ffmpeg command, capturing its output only on failure.
+
+    The first attempt sends stdout/stderr to DEVNULL so Python never
+    buffers ffmpeg's per-frame log chatter; if it fails, the command is
+    re-run with capture so the error can be reported.
+
+    Args:
+        cmd: Full ffmpeg command line (starting with "ffmpeg").
+
+    Returns:
+        True on success, False on failure.
+    """
+    quiet_cmd = cmd[:1] + ["-hide_banner", "-loglevel", "error", "-nostats"] + cmd[1:]
+
+    try:
+        subprocess.run(
+            quiet_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+        return True
+    except FileNotFoundError:
+        print("  Error: ffmpeg not found. Please install ffmpeg.")
+        sys.exit(1)
+    except subprocess.CalledProcessError:
+        pass
+
+    # Re-run capturing stderr for the error report
+    try:
+        subprocess.run(quiet_cmd, capture_output=True, text=True, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"  ffmpeg error: {e.stderr}")
+        return False
+
+
+def extract_clip(
+    input_path: str, output_path: str, start: float, end: float, precise: bool = False
+) -> bool:
     """Extract a clip using ffmpeg without re-encoding (fast).
 
     Args:
@@ -72,34 +207,88 @@ def extract_clip(input_path: str, output_path: str, start: float, end: float) ->
         output_path: Path to the output video file.
         start: Start time in seconds.
         end: End time in seconds.
+        precise: Re-encode for frame-accurate cuts instead of the default
+            keyframe-aligned stream copy. Uses NVENC (hardware encode) when
+            ffmpeg has it, software x264 otherwise.
 
     Returns:
         True on success, False on failure.
     """
     duration = end - start
 
-    cmd = [
-        "ffmpeg",
-        "-y",  # Overwrite output
-        "-ss",
-        f"{start:.3f}",  # Start time
-        "-i",
-        input_path,  # Input file
-        "-t",
-        f"{duration:.3f}",  # Duration
-        "-c",
-        "copy",  # Copy streams (no re-encode)
-        "-avoid_negative_ts",
-        "make_zero",
-        output_path,
-    ]
+    if precise:
+        if nvenc_available():
+            # Decode and encode on the GPU; frames never leave device memory
+            codec_args = [
+                "-hwaccel", "cuda", "-hwaccel_output_format", "cuda",
+            ]
+            encode_args = ["-c:v", "h264_nvenc", "-preset", "p1", "-b:v", "8M", "-c:a", "copy"]
+        else:
+            codec_args = []
+            encode_args = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-c:a", "copy"]
 
-    try:
-        _ = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"  ffmpeg error: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print("  Error: ffmpeg not found. Please install ffmpeg.")
-        sys.exit(1)
+        cmd = [
+            "ffmpeg",
+            "-nostdin",  # Never read from the terminal
+            "-y",  # Overwrite output
+            *codec_args,
+            "-ss",
+            f"{start:.3f}",  # Start time (accurate when re-encoding)
+            "-i",
+            input_path,  # Input file
+            "-t",
+            f"{duration:.3f}",  # Duration
+            *encode_args,
+            output_path,
+        ]
+    else:
+        cmd = [
+            "ffmpeg",
+            "-nostdin",  # Never read from the terminal
+            "-y",  # Overwrite output
+            "-ss",
+            f"{start:.3f}",  # Start time (input-side: jump via the container index)
+            "-noaccurate_seek",  # Land on the nearest keyframe instead of scanning
+            "-i",
+            input_path,  # Input file
+            "-t",
+            f"{duration:.3f}",  # Duration
+            "-c",
+            "copy",  # Copy streams (no re-encode)
+            output_path,
+        ]
+
+    return run_ffmpeg_quiet(cmd)
+
+
+def extract_clips_batch(input_path: str, clips: list[tuple[float, float, str]]) -> bool:
+    """Extract several clips from one video in a single ffmpeg invocation.
+
+    ffmpeg reads the input once and writes every output, so process
+    startup and container parsing are paid once per video instead of once
+    per clip.
+
+    Args:
+        input_path: Path to the input video file.
+        clips: List of (start, end, output_path) tuples.
+
+    Returns:
+        True on success, False on failure.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-y", "-i", input_path]
+    for start, end, output_path in clips:
+        cmd += [
+            "-ss",
+            f"{start:.3f}",  # Start time (output-side: packets before it are dropped)
+            "-to",
+            f"{end:.3f}",  # End time on the input timeline
+            "-map",
+            "0",  # Carry every input stream (video, audio, data) into the clip
+            "-c",
+            "copy",  # Copy streams (no re-encode)
+            "-avoid_negative_ts",
+            "make_zero",
+            output_path,
+        ]
+
+    return run_ffmpeg_quiet(cmd)